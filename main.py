@@ -1,5 +1,10 @@
 import asyncio
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from src.exchanges.common import ExchangeClient
 from src.exchanges.common.models import PositionSide
 from src.exchanges.gate import GateClient
@@ -41,4 +46,7 @@ async def main():
                 await bot.run()
         
 
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 asyncio.run(main())
\ No newline at end of file
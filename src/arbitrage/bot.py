@@ -1,4 +1,5 @@
 import asyncio
+from dataclasses import replace
 from decimal import Decimal
 
 from .spread import SpreadFinder
@@ -60,10 +61,11 @@ class Bot:
             self.hyperliquid.orderbook_monitor.start(self.symbols)
         )
 
-        # Получаем балансы
-        self.gate_balance, self.hyperliquid_balance = await asyncio.gather(
+        # Получаем балансы и устанавливаем плечи одним gather
+        self.gate_balance, self.hyperliquid_balance, _ = await asyncio.gather(
             self.gate.get_balance(),
-            self.hyperliquid.get_balance()
+            self.hyperliquid.get_balance(),
+            self._prepare_leverages()
         )
 
         logger.info(
@@ -71,9 +73,6 @@ class Bot:
             f"HL: ${self.hyperliquid_balance.available}"
         )
 
-        # Устанавливаем плечи
-        await self._prepare_leverages()
-
         # Фильтруем по объему если необходимо
         if isinstance(self.mode, MinSpread) and self.mode.min_24h_volume_usd > 0:
             await self._filter_by_volume()
@@ -167,10 +166,15 @@ class Bot:
 
     def _update_local_balances(self, gate_amount: Decimal, hl_amount: Decimal):
         """Обновляет локальные балансы после операций"""
+        # Balance неизменяемый: подменяем объект целиком
         if self.gate_balance:
-            self.gate_balance.available += gate_amount
+            self.gate_balance = replace(
+                self.gate_balance, available=self.gate_balance.available + gate_amount
+            )
         if self.hyperliquid_balance:
-            self.hyperliquid_balance.available += hl_amount
+            self.hyperliquid_balance = replace(
+                self.hyperliquid_balance, available=self.hyperliquid_balance.available + hl_amount
+            )
 
 
     async def _refresh_balances(self):
@@ -201,18 +205,23 @@ class Bot:
                 self.hyperliquid_balance.available >= size_dec)
 
 
-    async def _handle_min_spread_mode(self, symbol: str):
-        """Обработка режима MinSpread"""
-        mode: MinSpread = self.mode
+    def _find_min_spread_candidates(self) -> list[str]:
+        """Синхронно отбирает символы по сырому спреду из локального кэша цен"""
+        threshold = self.mode.percentage
+        get_raw_spread_pct = self.finder.get_raw_spread_pct
 
-        # Быстрая проверка raw spread
-        raw_spread = self.finder.get_raw_spread(symbol)
-        if not raw_spread or float(raw_spread.spread_pct) < mode.percentage:
-            return
+        candidates = []
+        for symbol in self.symbols:
+            spread_pct = get_raw_spread_pct(symbol)
+            if spread_pct is not None and spread_pct >= threshold:
+                candidates.append(symbol)
+
+        return candidates
 
-        # Проверка баланса
-        if not self._check_balance_available(mode.usd_size_per_pos):
-            return
+
+    async def _handle_min_spread_mode(self, symbol: str):
+        """Обработка режима MinSpread (символ уже прошел проверку raw spread)"""
+        mode: MinSpread = self.mode
 
         # Вычисляем точный net spread
         net_spread = await self.finder.calculate_net_spread(symbol, mode.usd_size_per_pos)
@@ -224,6 +233,10 @@ class Bot:
         if spread_pct < mode.percentage:
             return
 
+        # Баланс мог уйти на позиции, открытые пока считался net spread
+        if not self._check_balance_available(mode.usd_size_per_pos):
+            return
+
         logger.info(
             f"[BOT] {symbol} | Dir: {net_spread.best_direction.value} | "
             f"Spread: {spread_pct:.4f}% | Profit: ${net_spread.best_usd_profit}"
@@ -252,10 +265,14 @@ class Bot:
         while self._running:
             try:
                 # Обрабатываем MinSpread mode
-                if isinstance(self.mode, MinSpread):
-                    # Проверяем все символы параллельно БЕЗ ИСКУССТВЕННОЙ ЗАДЕРЖКИ
-                    tasks = [self._handle_min_spread_mode(symbol) for symbol in self.symbols]
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                # Баланс от символа не зависит: проверяем один раз за итерацию
+                if isinstance(self.mode, MinSpread) and self._check_balance_available(self.mode.usd_size_per_pos):
+                    # Корутины создаем только для кандидатов, остальные символы
+                    # отсеиваются без await
+                    candidates = self._find_min_spread_candidates()
+                    if candidates:
+                        tasks = [self._handle_min_spread_mode(symbol) for symbol in candidates]
+                        await asyncio.gather(*tasks, return_exceptions=True)
 
                 # Минимальная задержка для предотвращения 100% CPU
                 # В продакшене можно убрать или уменьшить до 0.001
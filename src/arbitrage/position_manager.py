@@ -1,11 +1,11 @@
 import asyncio
 import time
-from decimal import Decimal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from uuid import uuid4
 
 from ..exchanges.common import ExchangeClient, Order, PositionSide
 from .models import SpreadDirection, MinSpread
+from .spread import raw_spread_pct
 from ..logger import logger
 
 
@@ -18,15 +18,31 @@ class ArbitragePosition:
     hl_order: Order
     direction: SpreadDirection
     entry_spread_pct: float
-    open_time: float
     mode: MinSpread
+    open_time_ns: int = field(default_factory=time.monotonic_ns)
+    stop_loss_spread_pct: float = field(init=False)
+    deadline_ns: int = field(init=False)
+
+    def __post_init__(self):
+        # Порог стоп-лосса и дедлайн таймаута фиксированы на момент открытия
+        self.stop_loss_spread_pct = self.entry_spread_pct + self.mode.stop_loss_pct
+        self.deadline_ns = self.open_time_ns + int(self.mode.timeout_minutes * 60_000_000_000)
+
+    def get_duration_minutes(self) -> float:
+        """Время жизни позиции в минутах (монотонные часы)"""
+        return (time.monotonic_ns() - self.open_time_ns) / 60_000_000_000
+
+    def is_expired(self) -> bool:
+        """Проверяет истек ли таймаут позиции"""
+        return time.monotonic_ns() >= self.deadline_ns
 
 
 class PositionManager:
     """Управляет открытием, закрытием и мониторингом арбитражных позиций"""
     __slots__ = (
         'gate', 'hyperliquid', 'positions', '_monitor_task',
-        '_running', '_on_position_closed', '_check_event'
+        '_running', '_on_position_closed', '_check_event',
+        '_open_legs', '_close_legs'
     )
 
     def __init__(
@@ -43,6 +59,16 @@ class PositionManager:
         self._on_position_closed = on_position_closed
         self._check_event = asyncio.Event()
 
+        # Ордера по направлению: (gate, hyperliquid)
+        self._open_legs = {
+            SpreadDirection.GATE_SHORT: (gate.sell_market, hyperliquid.buy_market),
+            SpreadDirection.HL_SHORT: (gate.buy_market, hyperliquid.sell_market),
+        }
+        self._close_legs = {
+            SpreadDirection.GATE_SHORT: (gate.buy_market, hyperliquid.sell_market),
+            SpreadDirection.HL_SHORT: (gate.sell_market, hyperliquid.buy_market),
+        }
+
 
     async def open_position(
         self,
@@ -60,20 +86,19 @@ class PositionManager:
         position_id = str(uuid4())
 
         logger.info(
-            f"[POS OPEN] {symbol} | ID: {position_id[:8]} | Dir: {direction.value} | "
-            f"Size: ${size_usdt:.2f} | Entry: {entry_spread_pct:.4f}%"
+            "[POS OPEN] {} | ID: {:.8} | Dir: {} | Size: ${:.2f} | Entry: {:.4f}%",
+            symbol, position_id, direction.value, size_usdt, entry_spread_pct
         )
 
         try:
             # Открываем позиции параллельно
-            if direction == SpreadDirection.GATE_SHORT:
-                gate_task = self.gate.sell_market(symbol, size_usdt)
-                hl_task = self.hyperliquid.buy_market(symbol, size_usdt)
-            else:
-                gate_task = self.gate.buy_market(symbol, size_usdt)
-                hl_task = self.hyperliquid.sell_market(symbol, size_usdt)
+            gate_open, hl_open = self._open_legs[direction]
 
-            results = await asyncio.gather(gate_task, hl_task, return_exceptions=True)
+            results = await asyncio.gather(
+                gate_open(symbol, size_usdt),
+                hl_open(symbol, size_usdt),
+                return_exceptions=True
+            )
             gate_result, hl_result = results
 
             gate_order = None
@@ -86,8 +111,8 @@ class PositionManager:
             else:
                 gate_order = gate_result
                 logger.info(
-                    f"[POS OPEN] Gate filled | Price: {gate_order.fill_price} | "
-                    f"Size: {gate_order.size} | Fee: {gate_order.fee}"
+                    "[POS OPEN] Gate filled | Price: {} | Size: {} | Fee: {}",
+                    gate_order.fill_price, gate_order.size, gate_order.fee
                 )
 
             if isinstance(hl_result, Exception):
@@ -96,8 +121,8 @@ class PositionManager:
             else:
                 hl_order = hl_result
                 logger.info(
-                    f"[POS OPEN] HL filled | Price: {hl_order.fill_price} | "
-                    f"Size: {hl_order.size} | Fee: {hl_order.fee}"
+                    "[POS OPEN] HL filled | Price: {} | Size: {} | Fee: {}",
+                    hl_order.fill_price, hl_order.size, hl_order.fee
                 )
 
             # Если одна позиция не открылась - закрываем другую
@@ -118,15 +143,14 @@ class PositionManager:
                 hl_order=hl_order,
                 direction=direction,
                 entry_spread_pct=entry_spread_pct,
-                open_time=time.time(),
                 mode=mode
             )
 
             self.positions[position_id] = position
 
             logger.info(
-                f"[POS OPEN] Success {symbol} | ID: {position_id[:8]} | "
-                f"Gate: {gate_order.fill_price} | HL: {hl_order.fill_price}"
+                "[POS OPEN] Success {} | ID: {:.8} | Gate: {} | HL: {}",
+                symbol, position_id, gate_order.fill_price, hl_order.fill_price
             )
 
             # Сигнализируем монитору о необходимости проверки
@@ -145,22 +169,17 @@ class PositionManager:
         if not position:
             return None
 
-        logger.info(f"[POS CLOSE] {position.symbol} | ID: {position_id[:8]}")
+        logger.info("[POS CLOSE] {} | ID: {:.8}", position.symbol, position_id)
 
         try:
             # Закрываем позиции параллельно (обратные операции)
-            if position.direction == SpreadDirection.GATE_SHORT:
-                gate_size = float(position.gate_order.size)
-                hl_size = float(position.hl_order.size)
-                gate_task = self.gate.buy_market(position.symbol, gate_size)
-                hl_task = self.hyperliquid.sell_market(position.symbol, hl_size)
-            else:
-                gate_size = float(position.gate_order.size)
-                hl_size = float(position.hl_order.size)
-                gate_task = self.gate.sell_market(position.symbol, gate_size)
-                hl_task = self.hyperliquid.buy_market(position.symbol, hl_size)
+            gate_close, hl_close = self._close_legs[position.direction]
 
-            results = await asyncio.gather(gate_task, hl_task, return_exceptions=True)
+            results = await asyncio.gather(
+                gate_close(position.symbol, float(position.gate_order.size)),
+                hl_close(position.symbol, float(position.hl_order.size)),
+                return_exceptions=True
+            )
             gate_result, hl_result = results
 
             # Логируем результаты
@@ -168,16 +187,16 @@ class PositionManager:
                 logger.error(f"[POS CLOSE] Gate failed: {gate_result}")
             else:
                 logger.info(
-                    f"[POS CLOSE] Gate closed | Price: {gate_result.fill_price} | "
-                    f"Size: {gate_result.size}"
+                    "[POS CLOSE] Gate closed | Price: {} | Size: {}",
+                    gate_result.fill_price, gate_result.size
                 )
 
             if isinstance(hl_result, Exception):
                 logger.error(f"[POS CLOSE] HL failed: {hl_result}")
             else:
                 logger.info(
-                    f"[POS CLOSE] HL closed | Price: {hl_result.fill_price} | "
-                    f"Size: {hl_result.size}"
+                    "[POS CLOSE] HL closed | Price: {} | Size: {}",
+                    hl_result.fill_price, hl_result.size
                 )
 
             # Удаляем позицию из списка
@@ -187,8 +206,7 @@ class PositionManager:
                 return None
 
             # Вычисляем PNL
-            open_time_minutes = (time.time() - position.open_time) / 60
-            self._log_pnl(position, gate_result, hl_result, open_time_minutes)
+            self._log_pnl(position, gate_result, hl_result, position.get_duration_minutes())
 
             return (gate_result, hl_result)
 
@@ -239,10 +257,10 @@ class PositionManager:
             total_pnl = gate_pnl + hl_pnl - total_fees
 
             logger.info(
-                f"[POS PNL] {position.symbol} | ID: {position.position_id[:8]} | "
-                f"Duration: {duration_minutes:.1f}m | "
-                f"Gate PNL: ${gate_pnl:.2f} | HL PNL: ${hl_pnl:.2f} | "
-                f"Fees: ${total_fees:.2f} | Net PNL: ${total_pnl:.2f}"
+                "[POS PNL] {} | ID: {:.8} | Duration: {:.1f}m | "
+                "Gate PNL: ${:.2f} | HL PNL: ${:.2f} | Fees: ${:.2f} | Net PNL: ${:.2f}",
+                position.symbol, position.position_id, duration_minutes,
+                gate_pnl, hl_pnl, total_fees, total_pnl
             )
 
         except Exception as e:
@@ -270,19 +288,10 @@ class PositionManager:
 
     def _get_current_spread(self, position: ArbitragePosition) -> float | None:
         """Получает текущий спред для позиции из локальных цен"""
-        gate_price = self.gate.price_monitor.get_price(position.symbol)
-        hl_price = self.hyperliquid.price_monitor.get_price(position.symbol)
-
-        if not gate_price or not hl_price:
-            return None
-
-        # Вычисляем текущий спред
-        gate_dec = Decimal(str(gate_price))
-        hl_dec = Decimal(str(hl_price))
-        mid_price = (gate_dec + hl_dec) / Decimal('2')
-        spread_pct = abs(gate_dec - hl_dec) / mid_price * Decimal('100')
-
-        return float(spread_pct)
+        return raw_spread_pct(
+            self.gate.price_monitor.get_price(position.symbol),
+            self.hyperliquid.price_monitor.get_price(position.symbol)
+        )
 
 
     def _check_close_conditions(self, position: ArbitragePosition) -> tuple[bool, str]:
@@ -292,24 +301,29 @@ class PositionManager:
             return False, ""
 
         mode = position.mode
-        elapsed_minutes = (time.time() - position.open_time) / 60
 
         # Take Profit - спред сошелся до целевого значения
         if current_spread <= mode.target_spread_pct:
             return True, f"TP (spread {current_spread:.4f}% <= {mode.target_spread_pct}%)"
 
         # Stop Loss - спред расширился больше допустимого
-        stop_loss_threshold = position.entry_spread_pct + mode.stop_loss_pct
-        if current_spread >= stop_loss_threshold:
-            return True, f"SL (spread {current_spread:.4f}% >= {stop_loss_threshold:.4f}%)"
+        if current_spread >= position.stop_loss_spread_pct:
+            return True, f"SL (spread {current_spread:.4f}% >= {position.stop_loss_spread_pct:.4f}%)"
 
         # Timeout - время истекло и спред не достиг цели
-        if elapsed_minutes >= mode.timeout_minutes:
+        if position.is_expired():
+            elapsed_minutes = position.get_duration_minutes()
             return True, f"Timeout ({elapsed_minutes:.1f}m >= {mode.timeout_minutes}m, {current_spread:.4f}%)"
 
         return False, ""
 
 
+    async def _close_with_reason(self, position_id: str, reason: str) -> tuple[Order, Order] | None:
+        """Закрывает позицию с логированием причины"""
+        logger.info("[POS CLOSE] Reason: {}", reason)
+        return await self.close_position(position_id)
+
+
     async def monitor_positions(self):
         """Фоновая задача для мониторинга открытых позиций"""
         self._running = True
@@ -326,28 +340,33 @@ class PositionManager:
                 if not self.positions:
                     continue
 
-                # Проверяем все открытые позиции
+                # Проверяем все открытые позиции (без await внутри цикла,
+                # поэтому словарь не меняется и копия не нужна)
                 positions_to_close = []
 
-                for position_id, position in list(self.positions.items()):
+                for position_id, position in self.positions.items():
                     should_close, reason = self._check_close_conditions(position)
                     if should_close:
                         positions_to_close.append((position_id, reason))
 
-                # Закрываем позиции
-                for position_id, reason in positions_to_close:
-                    logger.info(f"[POS CLOSE] Reason: {reason}")
-                    result = await self.close_position(position_id)
-
-                    # Вызываем callback для обновления балансов
-                    if result and self._on_position_closed:
-                        try:
-                            if asyncio.iscoroutinefunction(self._on_position_closed):
-                                await self._on_position_closed()
-                            else:
-                                self._on_position_closed()
-                        except Exception as e:
-                            logger.error(f"[POS CLOSE] Callback error: {e}")
+                if not positions_to_close:
+                    continue
+
+                # Закрываем позиции параллельно
+                results = await asyncio.gather(*[
+                    self._close_with_reason(position_id, reason)
+                    for position_id, reason in positions_to_close
+                ])
+
+                # Вызываем callback для обновления балансов (один раз на пачку)
+                if any(results) and self._on_position_closed:
+                    try:
+                        if asyncio.iscoroutinefunction(self._on_position_closed):
+                            await self._on_position_closed()
+                        else:
+                            self._on_position_closed()
+                    except Exception as e:
+                        logger.error(f"[POS CLOSE] Callback error: {e}")
 
             except Exception as e:
                 logger.error(f"[POS MONITOR] Error: {e}")
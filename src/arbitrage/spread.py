@@ -1,13 +1,45 @@
-from decimal import Decimal
+import asyncio
+from decimal import Decimal, Context, ROUND_HALF_EVEN, localcontext
+from functools import lru_cache
 
-from ..exchanges.common import ExchangeClient, PositionSide
-from .models import RawSpread, SpreadDirection, NetSpread
+from ..exchanges.common import ExchangeClient
+from .models import SpreadDirection, NetSpread
 from ..settings import GATE_TAKER_FEE, HYPERLIQUID_TAKER_FEE
 
 
+__all__ = ['SpreadFinder', 'raw_spread_pct']
+
+
+# 14 значащих цифр достаточно для расчета спреда (по умолчанию prec=28)
+_NET_CTX = Context(prec=14, rounding=ROUND_HALF_EVEN)
+
+
+@lru_cache(maxsize=1024)
+def _cached_dec(value: float) -> Decimal:
+    return Decimal(str(value))
+
+
+def _dec_from_float(value: float) -> Decimal:
+    """Decimal из float с кэшем (размеры позиций берутся из небольшого набора)"""
+    if value != value:
+        return Decimal(str(value))
+    return _cached_dec(value)
+
+
+def raw_spread_pct(gate_price: float | None, hl_price: float | None) -> float | None:
+    """Сырой спред в процентах без комиссий: |gate - hl| / mid * 100"""
+    if not gate_price or not hl_price:
+        return None
+
+    return abs(gate_price - hl_price) / (gate_price + hl_price) * 200.0
+
+
 class SpreadFinder:
     """Вычисляет спреды между биржами"""
-    __slots__ = ('gate', 'hyperliquid', 'gate_fee', 'hl_fee', '_one', '_hundred')
+    __slots__ = (
+        'gate', 'hyperliquid', 'gate_fee', 'hl_fee', '_hundred',
+        '_gate_buy_mult', '_gate_sell_mult', '_hl_buy_mult', '_hl_sell_mult'
+    )
 
     def __init__(
         self,
@@ -22,32 +54,21 @@ class SpreadFinder:
         self.hl_fee = hyperliquid_taker_fee
 
         # Кэшируем константы для оптимизации
-        self._one = Decimal('1')
         self._hundred = Decimal('100')
 
+        # Множители цены с учетом комиссии считаем один раз
+        one = Decimal('1')
+        self._gate_buy_mult = one + gate_taker_fee
+        self._gate_sell_mult = one - gate_taker_fee
+        self._hl_buy_mult = one + hyperliquid_taker_fee
+        self._hl_sell_mult = one - hyperliquid_taker_fee
 
-    def get_raw_spread(self, symbol: str) -> RawSpread | None:
-        """Вычисляет сырой спред без учета комиссий (быстрый метод)"""
-        gate_price = self.gate.price_monitor.get_price(symbol)
-        hl_price = self.hyperliquid.price_monitor.get_price(symbol)
 
-        if not gate_price or not hl_price:
-            return None
-
-        gate_dec = Decimal(str(gate_price))
-        hl_dec = Decimal(str(hl_price))
-
-        # Оптимизация: используем среднее значение только для расчета процента
-        mid_price = (gate_dec + hl_dec) / Decimal('2')
-        spread_pct = abs(gate_dec - hl_dec) / mid_price * self._hundred
-
-        direction = SpreadDirection.GATE_SHORT if gate_dec > hl_dec else SpreadDirection.HL_SHORT
-
-        return RawSpread(
-            spread_pct=spread_pct,
-            direction=direction,
-            gate_price=gate_dec,
-            hl_price=hl_dec
+    def get_raw_spread_pct(self, symbol: str) -> float | None:
+        """Сырой спред символа в процентах по локальным ценам (для префильтра)"""
+        return raw_spread_pct(
+            self.gate.price_monitor.get_price(symbol),
+            self.hyperliquid.price_monitor.get_price(symbol)
         )
 
 
@@ -60,33 +81,35 @@ class SpreadFinder:
         # Параллельный запрос цен с учетом ликвидности
         gate_buy, gate_sell, hl_buy, hl_sell = await self._estimate_all_prices(symbol, size)
 
-        # Применяем комиссии
-        gate_buy_fee = gate_buy * (self._one + self.gate_fee)
-        gate_sell_fee = gate_sell * (self._one - self.gate_fee)
-        hl_buy_fee = hl_buy * (self._one + self.hl_fee)
-        hl_sell_fee = hl_sell * (self._one - self.hl_fee)
-
-        size_dec = Decimal(str(size))
-
-        # Gate SHORT, HL LONG
-        revenue_gate_short = gate_sell_fee * size_dec
-        cost_gate_short = hl_buy_fee * size_dec
-        profit_gate_short = revenue_gate_short - cost_gate_short
-        spread_gate_short = profit_gate_short / cost_gate_short * self._hundred
-
-        # HL SHORT, Gate LONG
-        revenue_hl_short = hl_sell_fee * size_dec
-        cost_hl_short = gate_buy_fee * size_dec
-        profit_hl_short = revenue_hl_short - cost_hl_short
-        spread_hl_short = profit_hl_short / cost_hl_short * self._hundred
-
-        # Определяем лучшее направление
-        if profit_gate_short > profit_hl_short:
-            best_direction = SpreadDirection.GATE_SHORT
-            best_profit = profit_gate_short
-        else:
-            best_direction = SpreadDirection.HL_SHORT
-            best_profit = profit_hl_short
+        with localcontext(_NET_CTX):
+            # Применяем комиссии
+            gate_buy_fee = gate_buy * self._gate_buy_mult
+            gate_sell_fee = gate_sell * self._gate_sell_mult
+            hl_buy_fee = hl_buy * self._hl_buy_mult
+            hl_sell_fee = hl_sell * self._hl_sell_mult
+
+            size_dec = _dec_from_float(size)
+
+            # Спред от размера не зависит: считаем его по ценам за единицу,
+            # а на размер умножаем только итоговую разницу
+
+            # Gate SHORT, HL LONG
+            edge_gate_short = gate_sell_fee - hl_buy_fee
+            spread_gate_short = edge_gate_short / hl_buy_fee * self._hundred
+            profit_gate_short = edge_gate_short * size_dec
+
+            # HL SHORT, Gate LONG
+            edge_hl_short = hl_sell_fee - gate_buy_fee
+            spread_hl_short = edge_hl_short / gate_buy_fee * self._hundred
+            profit_hl_short = edge_hl_short * size_dec
+
+            # Определяем лучшее направление
+            if profit_gate_short > profit_hl_short:
+                best_direction = SpreadDirection.GATE_SHORT
+                best_profit = profit_gate_short
+            else:
+                best_direction = SpreadDirection.HL_SHORT
+                best_profit = profit_hl_short
 
         return NetSpread(
             symbol=symbol,
@@ -101,14 +124,10 @@ class SpreadFinder:
 
 
     async def _estimate_all_prices(self, symbol: str, size: float) -> tuple[Decimal, Decimal, Decimal, Decimal]:
-        """Параллельно оценивает все 4 цены для ускорения"""
-        import asyncio
-
-        tasks = [
-            self.gate.estimate_fill_price(symbol, size, PositionSide.LONG),
-            self.gate.estimate_fill_price(symbol, size, PositionSide.SHORT),
-            self.hyperliquid.estimate_fill_price(symbol, size, PositionSide.LONG),
-            self.hyperliquid.estimate_fill_price(symbol, size, PositionSide.SHORT)
-        ]
+        """Оценивает все 4 цены: по одному снимку стакана на биржу, обе стороны сразу"""
+        (gate_buy, gate_sell), (hl_buy, hl_sell) = await asyncio.gather(
+            self.gate.estimate_fill_prices(symbol, size),
+            self.hyperliquid.estimate_fill_prices(symbol, size)
+        )
 
-        return await asyncio.gather(*tasks)
+        return gate_buy, gate_sell, hl_buy, hl_sell
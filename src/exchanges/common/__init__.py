@@ -1,6 +1,10 @@
+from .coalescer import RequestCoalescer
 from .exceptions import ExchangeError, InsufficientBalanceError, InvalidSymbolError, OrderError
+from .fill import book_fill_price, fill_price
+from .leverage import apply_leverages
 from .models import Balance, Order, OrderStatus, Position, PositionSide, SymbolInfo, Volume24h, FundingRate, OrderbookLevel, Orderbook
 from .protocols import ExchangeClient, PriceProvider, OrderbookProvider
+from .rate_limiter import AsyncRateLimiter
 
 
 __all__ = [
@@ -23,4 +27,9 @@ __all__ = [
     'ExchangeClient',
     'PriceProvider',
     'OrderbookProvider',
+    'AsyncRateLimiter',
+    'RequestCoalescer',
+    'apply_leverages',
+    'book_fill_price',
+    'fill_price',
 ]
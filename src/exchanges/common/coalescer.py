@@ -0,0 +1,24 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+__all__ = ['RequestCoalescer']
+
+
+class RequestCoalescer:
+    __slots__ = ('_inflight',)
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future] = {}
+
+
+    async def run(self, key: str, make_awaitable: Callable[[], Awaitable[Any]]) -> Any:
+        # Одновременные вызовы с одним ключом ждут один и тот же запрос
+        future = self._inflight.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(make_awaitable())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(future)
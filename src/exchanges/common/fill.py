@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+from .exceptions import OrderError
+from .models import Orderbook, OrderbookLevel, PositionSide
+
+
+__all__ = ['book_fill_price', 'fill_price']
+
+
+_ZERO = Decimal('0')
+# Экстраполяция цены за пределами видимой глубины стакана
+_SLIP_LONG = Decimal('1.005')
+_SLIP_SHORT = Decimal('0.995')
+
+
+def fill_price(levels: list[OrderbookLevel], size: float, side: PositionSide) -> Decimal:
+    target = Decimal(str(abs(size)))
+    remaining = target
+    total_cost = _ZERO
+
+    # Все уровни кроме последнего берутся целиком; сумма заполненного объема всегда равна target
+    for level in levels:
+        level_size = level.size
+        if level_size >= remaining:
+            total_cost += remaining * level.price
+            remaining = _ZERO
+            break
+
+        total_cost += level_size * level.price
+        remaining -= level_size
+
+    if remaining:
+        slippage_factor = _SLIP_LONG if side == PositionSide.LONG else _SLIP_SHORT
+        total_cost += remaining * levels[-1].price * slippage_factor
+
+    return total_cost / target
+
+
+def book_fill_price(book: Orderbook, size: float, side: PositionSide) -> Decimal:
+    """Цена исполнения по нужной стороне стакана: покупка идет по аскам, продажа по бидам"""
+    levels = book.asks if side == PositionSide.LONG else book.bids
+    if not levels:
+        raise OrderError(f"No orderbook data for {book.symbol}")
+    return fill_price(levels, size, side)
@@ -0,0 +1,29 @@
+import asyncio
+from typing import Awaitable, Callable
+
+
+__all__ = ['apply_leverages']
+
+
+async def apply_leverages(
+    leverages: dict[str, int],
+    needs_update: Callable[[str, int], bool],
+    set_leverage: Callable[[str, int], Awaitable[None]],
+    batch_size: int = 10
+) -> None:
+    # Уже выставленные плечи отсекаем до создания корутин
+    pending = [
+        (symbol, lev) for symbol, lev in leverages.items()
+        if needs_update(symbol, lev)
+    ]
+    if not pending:
+        return
+
+    # Одна волна запросов, но не больше batch_size одновременно
+    semaphore = asyncio.Semaphore(batch_size)
+
+    async def limited(symbol: str, lev: int) -> None:
+        async with semaphore:
+            await set_leverage(symbol, lev)
+
+    await asyncio.gather(*(limited(symbol, lev) for symbol, lev in pending))
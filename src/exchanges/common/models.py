@@ -1,7 +1,7 @@
+from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
-
-from pydantic import BaseModel, Field
+from typing import NamedTuple
 
 
 class PositionSide(str, Enum):
@@ -15,7 +15,8 @@ class OrderStatus(str, Enum):
     REJECTED = 'rejected'
 
 
-class Position(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Position:
     coin: str
     size: Decimal
     side: PositionSide
@@ -27,47 +28,54 @@ class Position(BaseModel):
     leverage: int | None = None
 
 
-class Order(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Order:
     order_id: str
     coin: str
     size: Decimal
     side: PositionSide
     fill_price: Decimal
     status: OrderStatus
-    fee: Decimal = Field(default=Decimal('0'))
+    fee: Decimal = Decimal('0')
 
 
-class Balance(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Balance:
     total: Decimal
     available: Decimal
     used: Decimal
 
 
-class SymbolInfo(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SymbolInfo:
     symbol: str
     max_leverage: int
     sz_decimals: int
 
 
-class OrderbookLevel(BaseModel):
+# Уровни создаются на каждое обновление стакана: NamedTuple строится быстрее frozen-датакласса
+class OrderbookLevel(NamedTuple):
     price: Decimal
     size: Decimal
 
 
-class Orderbook(BaseModel):
+@dataclass(slots=True)
+class Orderbook:
     symbol: str
     bids: list[OrderbookLevel]
     asks: list[OrderbookLevel]
     timestamp: int
 
 
-class FundingRate(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FundingRate:
     symbol: str
     rate: Decimal
     timestamp: int
 
 
-class Volume24h(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Volume24h:
     symbol: str
     base_volume: Decimal
     quote_volume: Decimal
@@ -1,10 +1,9 @@
-from typing import Protocol, runtime_checkable
+from typing import Protocol
 from decimal import Decimal
 
 from .models import Balance, Order, Position, SymbolInfo, FundingRate, Orderbook, Volume24h, PositionSide, OrderbookLevel
 
 
-@runtime_checkable
 class OrderbookProvider(Protocol):
     def get_orderbook(self, symbol: str) -> Orderbook | None: ...
 
@@ -15,7 +14,6 @@ class OrderbookProvider(Protocol):
     def has_orderbook(self, symbol: str) -> bool: ...
 
 
-@runtime_checkable
 class PriceProvider(Protocol):
     def get_price(self, symbol: str) -> float | None: ...
 
@@ -27,7 +25,6 @@ class PriceProvider(Protocol):
     def prices(self) -> dict[str, float]: ...
 
 
-@runtime_checkable
 class ExchangeClient(Protocol):
     price_monitor: PriceProvider
     orderbook_monitor: OrderbookProvider
@@ -55,3 +52,5 @@ class ExchangeClient(Protocol):
     async def get_24h_volume(self, symbol: str) -> Volume24h: ...
 
     async def estimate_fill_price(self, symbol: str, size: float, side: PositionSide, depth: int = 100) -> Decimal: ...
+
+    async def estimate_fill_prices(self, symbol: str, size: float, depth: int = 100) -> tuple[Decimal, Decimal]: ...
@@ -1,70 +1,107 @@
 from decimal import Decimal
+from functools import lru_cache
+from operator import itemgetter
 from typing import Any
 
 from ..common.models import Balance, Order, OrderStatus, Position, PositionSide, SymbolInfo, FundingRate, Orderbook, Volume24h, PositionSide, OrderbookLevel
 
 
-def adapt_position(raw: dict[str, Any]) -> Position | None:
-    size = raw.get('size', 0)
+_ZERO = Decimal('0')
+_LONG = PositionSide.LONG
+_SHORT = PositionSide.SHORT
+
+_level_fields = itemgetter('p', 's')
+
+_STATUS_MAP = {
+    'finished': OrderStatus.FILLED,
+    'open': OrderStatus.PARTIAL,
+}
+
+# 'COIN_USDT' -> 'COIN': набор контрактов ограничен, кэш насыщается после прогрева
+_COIN_CACHE: dict[str, str] = {}
+
+
+def coin_from_contract(contract: str) -> str:
+    coin = _COIN_CACHE.get(contract)
+    if coin is None:
+        coin = contract[:-5] if contract.endswith('_USDT') else contract.replace('_USDT', '')
+        _COIN_CACHE[contract] = coin
+    return coin
+
+
+@lru_cache(maxsize=256)
+def _fee_rate(value: str) -> Decimal:
+    # Ставка taker-комиссии принимает несколько значений на уровень аккаунта
+    return abs(Decimal(value))
+
+
+def _abs_size(size: int | float) -> Decimal:
+    # Размер на Gate - целое число контрактов: Decimal(int) идет без форматирования в str
+    if isinstance(size, int):
+        return Decimal(abs(size))
+    return Decimal(str(abs(size)))
+
+
+# adapt_position/adapt_order/adapt_balance читают поля моделей gate_api напрямую, без to_dict()
+def adapt_position(raw: Any) -> Position | None:
+    size = raw.size or 0
     if size == 0:
         return None
     
-    margin_used = Decimal(raw.get('initial_margin', '0'))
-    if margin_used == 0:
-        value = Decimal(raw.get('value', '0'))
-        leverage_str = raw.get('leverage', '0')
-        if leverage_str and leverage_str != '0':
-            leverage_val = Decimal(leverage_str)
-        if leverage_val > 0:
-            margin_used = value / leverage_val
+    leverage_str = raw.leverage
+    has_leverage = bool(leverage_str) and leverage_str != '0'
+    leverage = int(leverage_str) if has_leverage else None
     
-    leverage_str = raw.get('leverage', '0')
-    leverage = int(leverage_str) if leverage_str and leverage_str != '0' else None
+    margin_used = Decimal(raw.initial_margin or '0')
+    if margin_used == 0 and has_leverage:
+        leverage_val = Decimal(leverage_str)
+        if leverage_val > 0:
+            margin_used = Decimal(raw.value or '0') / leverage_val
     
-    liq_price_str = raw.get('liq_price', '0')
+    liq_price_str = raw.liq_price
     liq_price = None
     if liq_price_str and liq_price_str != '0':
         liq_price = Decimal(liq_price_str)
     
     return Position(
-        coin=raw['contract'].replace('_USDT', ''),
-        size=Decimal(str(abs(size))),
-        side=PositionSide.LONG if size > 0 else PositionSide.SHORT,
-        entry_price=Decimal(raw.get('entry_price', '0')),
-        mark_price=Decimal(raw.get('mark_price', '0')),
-        unrealized_pnl=Decimal(raw.get('unrealised_pnl', '0')),
+        coin=coin_from_contract(raw.contract),
+        size=_abs_size(size),
+        side=_LONG if size > 0 else _SHORT,
+        entry_price=Decimal(raw.entry_price or '0'),
+        mark_price=Decimal(raw.mark_price or '0'),
+        unrealized_pnl=Decimal(raw.unrealised_pnl or '0'),
         liquidation_price=liq_price,
         margin_used=margin_used,
         leverage=leverage,
     )
 
 
-def adapt_order(raw: dict[str, Any]) -> Order:
-    size = raw['size']
+def adapt_order(raw: Any) -> Order:
+    size = raw.size
+    abs_size = _abs_size(size)
+    fill_price = Decimal(raw.fill_price)
     
-    fee_rate = Decimal(raw.get('tkfr', '0'))
-    fill_price = Decimal(raw['fill_price'])
-    fee = abs(Decimal(str(size)) * fill_price * fee_rate)
-    
-    status_map = {
-        'finished': OrderStatus.FILLED,
-        'open': OrderStatus.PARTIAL,
-    }
+    # Размер и цена неотрицательны: знак комиссии снимаем только со ставки
+    tkfr = raw.tkfr
+    if tkfr and tkfr != '0':
+        fee = abs_size * fill_price * _fee_rate(tkfr)
+    else:
+        fee = _ZERO
     
     return Order(
-        order_id=str(raw['id']),
-        coin=raw['contract'].replace('_USDT', ''),
-        size=Decimal(str(abs(size))),
-        side=PositionSide.LONG if size > 0 else PositionSide.SHORT,
+        order_id=str(raw.id),
+        coin=coin_from_contract(raw.contract),
+        size=abs_size,
+        side=_LONG if size > 0 else _SHORT,
         fill_price=fill_price,
-        status=status_map.get(raw.get('status', 'finished'), OrderStatus.FILLED),
+        status=_STATUS_MAP.get(raw.status or 'finished', OrderStatus.FILLED),
         fee=fee,
     )
 
 
-def adapt_balance(raw: dict[str, Any]) -> Balance:
-    total = Decimal(raw.get('total', '0'))
-    available = Decimal(raw.get('available', '0'))
+def adapt_balance(raw: Any) -> Balance:
+    total = Decimal(raw.total or '0')
+    available = Decimal(raw.available or '0')
     
     return Balance(
         total=total,
@@ -81,28 +118,23 @@ def adapt_symbol_info(raw: dict[str, Any], symbol: str) -> SymbolInfo:
     )
 
 
-def adapt_funding_rate(raw: dict[str, Any], symbol: str) -> FundingRate:
+def adapt_contract_funding_rate(raw: dict[str, Any], symbol: str) -> FundingRate:
     return FundingRate(
         symbol=symbol,
-        rate=Decimal(raw['r']),
-        timestamp=raw['t']
+        rate=Decimal(raw['funding_rate']),
+        timestamp=int(raw.get('funding_next_apply') or 0)
     )
 
 
+def adapt_levels(raw_levels: list[dict[str, Any]]) -> list[OrderbookLevel]:
+    return [OrderbookLevel(Decimal(p), Decimal(s)) for p, s in map(_level_fields, raw_levels)]
+
+
 def adapt_orderbook(raw: dict[str, Any], symbol: str) -> Orderbook:
-    bids = [
-        OrderbookLevel(price=Decimal(level['p']), size=Decimal(str(level['s'])))
-        for level in raw['bids']
-    ]
-    asks = [
-        OrderbookLevel(price=Decimal(level['p']), size=Decimal(str(level['s'])))
-        for level in raw['asks']
-    ]
-    
     return Orderbook(
         symbol=symbol,
-        bids=bids,
-        asks=asks,
+        bids=adapt_levels(raw['bids']),
+        asks=adapt_levels(raw['asks']),
         timestamp=int(raw['current'] * 1000)
     )
 
@@ -1,16 +1,24 @@
 import asyncio
-from typing import Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
 from decimal import Decimal
 
 import gate_api
 from gate_api import ApiClient, Configuration, FuturesApi, FuturesOrder
 from gate_api.exceptions import GateApiException
 
+from ..common.coalescer import RequestCoalescer
 from ..common.exceptions import OrderError
+from ..common.fill import book_fill_price
+from ..common.leverage import apply_leverages
+from ..common.rate_limiter import AsyncRateLimiter
 from ..common.models import Balance, FundingRate, Order, Orderbook, Position, PositionSide, SymbolInfo, Volume24h
-from .adapters import adapt_balance, adapt_funding_rate, adapt_order, adapt_orderbook, adapt_position, adapt_symbol_info, adapt_volume_24h
+from .adapters import adapt_balance, adapt_order, adapt_orderbook, adapt_position, adapt_symbol_info, adapt_contract_funding_rate, adapt_volume_24h
 from .price_monitor import GatePriceMonitor
 from .orderbook_monitor import GateOrderbookMonitor
+from .rest import GateRestClient, GateRestError
 
 from ...logger import logger
 
@@ -25,13 +33,21 @@ class GateClient:
         'settle',
         'dual_mode',
         'contracts_cache_interval',
+        'funding_cache_ttl',
         'config',
         'client',
         'futures_api',
+        'rest',
         'price_monitor',
         'orderbook_monitor',
         'contracts_meta',
+        '_contract_by_symbol',
+        '_symbol_info_cache',
         '_leverage_cache',
+        '_funding_cache',
+        '_coalescer',
+        '_rest_limiter',
+        '_executor',
         '_update_task',
         '_shutdown'
     )
@@ -43,22 +59,36 @@ class GateClient:
         settle: str = 'usdt',
         dual_mode: bool = False,
         host: str = 'https://api.gateio.ws/api/v4',
-        contracts_cache_interval: int = 300
+        contracts_cache_interval: int = 300,
+        rest_rate_limit: float = 20.0,
+        funding_cache_ttl: float = 60.0,
+        max_workers: int = 32
     ):
         self.api_key = api_key
         self.api_secret = api_secret
         self.settle = settle
         self.dual_mode = dual_mode
         self.contracts_cache_interval = contracts_cache_interval
+        self.funding_cache_ttl = funding_cache_ttl
         
         self.config = Configuration(host=host, key=api_key, secret=api_secret)
+        # Пул соединений urllib3 по числу рабочих потоков: каждый поток держит свое соединение
+        self.config.connection_pool_maxsize = max_workers
         self.client = ApiClient(self.config)
         self.futures_api = FuturesApi(self.client)
         
+        self._rest_limiter = AsyncRateLimiter(rest_rate_limit)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gate-rest')
+        self.rest = GateRestClient(host, settle, self._rest_limiter)
+        
         self.price_monitor = GatePriceMonitor(settle)
-        self.orderbook_monitor = GateOrderbookMonitor(settle, self.futures_api)
+        self.orderbook_monitor = GateOrderbookMonitor(settle, self.rest)
         self.contracts_meta: dict[str, Any] = {}
+        self._contract_by_symbol: dict[str, str] = {}
+        self._symbol_info_cache: dict[str, SymbolInfo] = {}
         self._leverage_cache: dict[str, int] = {}
+        self._funding_cache: dict[str, tuple[FundingRate, float]] = {}
+        self._coalescer = RequestCoalescer()
         self._update_task = None
         self._shutdown = asyncio.Event()
 
@@ -73,37 +103,52 @@ class GateClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         self._shutdown.set()
         if self._update_task:
+            self._update_task.cancel()
             await self._update_task
 
         await self.price_monitor.stop()
         await self.orderbook_monitor.stop()
 
+        await self.rest.close()
+        
         if self.client:
             self.client.close()
+        
+        self._executor.shutdown(wait=False)
 
 
     async def _init_setup(self) -> None:
+        await self.rest.start()
         await self._refresh_contracts()
         await self._set_position_mode()
         self._update_task = asyncio.create_task(self._contracts_updater())
 
 
     async def _refresh_contracts(self) -> None:
-        contracts = await asyncio.to_thread(
-        self.futures_api.list_futures_contracts,
-        self.settle
-        )
-        
-        cache = {}
-        for contract in contracts:
-            cache[contract.name] = contract.to_dict()
+        # Сырой JSON сразу дает словари: без моделей SDK и их to_dict()
+        contracts = await self.rest.get('/contracts')
+        cache = {contract['name']: contract for contract in contracts}
         
         self.contracts_meta = cache
+        self._contract_by_symbol = {
+            name[:-5]: name for name in cache if name.endswith('_USDT')
+        }
+        # SymbolInfo меняется только вместе с метаданными контрактов: строим заранее
+        self._symbol_info_cache = {
+            symbol: adapt_symbol_info(cache[name], symbol)
+            for symbol, name in self._contract_by_symbol.items()
+        }
+        # Ставка и время следующего списания приходят в том же ответе: кэш фандинга всегда согласован
+        expiry = time.monotonic() + self.funding_cache_ttl
+        self._funding_cache = {
+            symbol: (adapt_contract_funding_rate(cache[name], symbol), expiry)
+            for symbol, name in self._contract_by_symbol.items()
+        }
 
 
     async def _set_position_mode(self) -> None:
         try:
-            account = await asyncio.to_thread(
+            account = await self._call(
                 self.futures_api.list_futures_accounts,
                 self.settle
             )
@@ -111,7 +156,7 @@ class GateClient:
             current_dual = getattr(account, 'in_dual_mode', False) or getattr(account, 'enable_new_dual_mode', False)
             
             if current_dual != self.dual_mode:
-                positions = await asyncio.to_thread(
+                positions = await self._call(
                 self.futures_api.list_positions,
                 self.settle
                 )
@@ -121,7 +166,7 @@ class GateClient:
                         f"Cannot switch to {'dual' if self.dual_mode else 'single'} mode: close all positions first"
                     )
                 
-                await asyncio.to_thread(
+                await self._call(
                 self.futures_api.set_dual_mode,
                 self.settle,
                 self.dual_mode
@@ -134,26 +179,38 @@ class GateClient:
     async def _contracts_updater(self) -> None:
         while not self._shutdown.is_set():
             try:
-                await asyncio.wait_for(
-                self._shutdown.wait(),
-                timeout=self.contracts_cache_interval
-                )
-            except asyncio.TimeoutError:
-                await self._refresh_contracts()
+                await asyncio.sleep(self.contracts_cache_interval)
+                await self._coalescer.run('contracts', self._refresh_contracts)
+            except asyncio.CancelledError:
+                break
+
+
+    def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> asyncio.Future:
+        if kwargs:
+            fn = partial(fn, *args, **kwargs)
+            args = ()
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
 
 
     def _symbol_to_contract(self, symbol: str) -> str:
-        return f'{symbol}_USDT'
+        contract = self._contract_by_symbol.get(symbol)
+        if contract is None:
+            return f'{symbol}_USDT'
+        return contract
+
+
+    def _needs_leverage_update(self, symbol: str, leverage: int) -> bool:
+        return self._leverage_cache.get(self._symbol_to_contract(symbol)) != leverage
 
 
     async def set_leverage(self, symbol: str, leverage: int) -> None:
-        contract = self._symbol_to_contract(symbol)
-        
-        if self._leverage_cache.get(contract) == leverage:
+        if not self._needs_leverage_update(symbol, leverage):
             return
         
+        contract = self._symbol_to_contract(symbol)
+        
         try:
-            await asyncio.to_thread(
+            await self._call(
                 self.futures_api.update_position_leverage,
                 self.settle,
                 contract,
@@ -165,24 +222,15 @@ class GateClient:
 
 
     async def set_leverages(self, leverages: dict[str, int], batch_size: int = 10) -> None:
-        items = list(leverages.items())
-        
-        for i in range(0, len(items), batch_size):
-            batch = items[i:i + batch_size]
-            tasks = [self.set_leverage(symbol, lev) for symbol, lev in batch]
-            await asyncio.gather(*tasks)
+        await apply_leverages(leverages, self._needs_leverage_update, self.set_leverage, batch_size)
 
 
     def get_symbol_info(self, symbol: str) -> SymbolInfo | None:
-        contract = self._symbol_to_contract(symbol)
-        raw = self.contracts_meta.get(contract)
-        if not raw:
-            return None
-        return adapt_symbol_info(raw, symbol)
+        return self._symbol_info_cache.get(symbol)
 
 
     def get_available_symbols(self) -> set[str]:
-        return {contract.replace('_USDT', '') for contract in self.contracts_meta.keys()}
+        return set(self._contract_by_symbol)
 
 
     async def buy_market(self, symbol: str, size: float) -> Order:
@@ -196,12 +244,12 @@ class GateClient:
         )
         
         try:
-            raw = await asyncio.to_thread(
+            raw = await self._call(
                 self.futures_api.create_futures_order,
                 self.settle,
                 order
             )
-            return adapt_order(raw.to_dict())
+            return adapt_order(raw)
         except GateApiException as ex:
             raise OrderError(f"Failed to buy market: {ex.message}") from ex
 
@@ -217,26 +265,25 @@ class GateClient:
         )
         
         try:
-            raw = await asyncio.to_thread(
+            raw = await self._call(
                 self.futures_api.create_futures_order,
                 self.settle,
                 order
             )
-            return adapt_order(raw.to_dict())
+            return adapt_order(raw)
         except GateApiException as ex:
             raise OrderError(f"Failed to sell market: {ex.message}") from ex
 
 
     async def get_positions(self) -> list[Position]:
         try:
-            raw_positions = await asyncio.to_thread(
-                self.futures_api.list_positions,
-                self.settle
+            raw_positions = await self._coalescer.run(
+                'positions', lambda: self._call(self.futures_api.list_positions, self.settle)
             )
             
             positions = []
             for raw in raw_positions:
-                pos = adapt_position(raw.to_dict())
+                pos = adapt_position(raw)
                 if pos:
                     positions.append(pos)
             
@@ -247,46 +294,38 @@ class GateClient:
 
     async def get_balance(self) -> Balance:
         try:
-            account = await asyncio.to_thread(
-                self.futures_api.list_futures_accounts,
-                self.settle
+            account = await self._coalescer.run(
+                'accounts', lambda: self._call(self.futures_api.list_futures_accounts, self.settle)
             )
-            return adapt_balance(account.to_dict())
+            return adapt_balance(account)
         except GateApiException as ex:
             raise OrderError(f"Failed to get balance: {ex.message}") from ex
 
 
     async def get_funding_rate(self, symbol: str) -> FundingRate:
-        contract = self._symbol_to_contract(symbol)
+        cached = self._funding_cache.get(symbol)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
         
         try:
-            raw = await asyncio.to_thread(
-                self.futures_api.list_futures_funding_rate_history,
-                self.settle,
-                contract,
-                limit=1
-            )
-            
-            if not raw:
-                raise OrderError(f"No funding rate data for {symbol}")
-            
-            return adapt_funding_rate(raw[0].to_dict(), symbol)
-        except GateApiException as ex:
+            # Метаданные всех контрактов приходят одним запросом: обновляем кэш целиком
+            await self._coalescer.run('contracts', self._refresh_contracts)
+        except GateRestError as ex:
             raise OrderError(f"Failed to get funding rate for {symbol}: {ex.message}") from ex
+        
+        cached = self._funding_cache.get(symbol)
+        if cached is None:
+            raise OrderError(f"No funding rate data for {symbol}")
+        return cached[0]
 
 
     async def get_orderbook(self, symbol: str, depth: int = 20) -> Orderbook:
         contract = self._symbol_to_contract(symbol)
         
         try:
-            raw = await asyncio.to_thread(
-                self.futures_api.list_futures_order_book,
-                self.settle,
-                contract,
-                limit=depth
-            )
-            return adapt_orderbook(raw.to_dict(), symbol)
-        except GateApiException as ex:
+            raw = await self.rest.get('/order_book', {'contract': contract, 'limit': depth})
+            return adapt_orderbook(raw, symbol)
+        except GateRestError as ex:
             raise OrderError(f"Failed to get orderbook for {symbol}: {ex.message}") from ex
 
 
@@ -294,49 +333,36 @@ class GateClient:
         contract = self._symbol_to_contract(symbol)
         
         try:
-            raw = await asyncio.to_thread(
-                self.futures_api.list_futures_tickers,
-                self.settle,
-                contract=contract
-            )
+            raw = await self.rest.get('/tickers', {'contract': contract})
             
             if not raw:
                 raise OrderError(f"No ticker data for {symbol}")
             
-            return adapt_volume_24h(raw[0].to_dict(), symbol)
-        except GateApiException as ex:
+            return adapt_volume_24h(raw[0], symbol)
+        except GateRestError as ex:
             raise OrderError(f"Failed to get 24h volume for {symbol}: {ex.message}") from ex
 
-    async def estimate_fill_price(self, symbol: str, size: float, side: PositionSide, depth: int = 100) -> Decimal:
+    async def _get_book(self, symbol: str, depth: int) -> Orderbook:
         book = self.orderbook_monitor.get_orderbook(symbol)
         
         if not book:
             book = await self.get_orderbook(symbol, depth=min(depth, 50))
         
-        levels = book.asks if side == PositionSide.LONG else book.bids
-        
-        if not levels:
-            raise OrderError(f"No orderbook data for {symbol}")
-        
-        remaining = Decimal(str(abs(size)))
-        total_cost = Decimal('0')
-        filled = Decimal('0')
-        
-        for level in levels:
-            if remaining <= 0:
-                break
-        
-            fill = min(remaining, level.size)
-            total_cost += fill * level.price
-            filled += fill
-            remaining -= fill
-        
-        if remaining > 0:
-            last_level = levels[-1]
-            slippage_factor = Decimal('1.005') if side == PositionSide.LONG else Decimal('0.995')
-            extrapolated_price = last_level.price * slippage_factor
-            
-            total_cost += remaining * extrapolated_price
-            filled += remaining
-        
-        return total_cost / filled
+        return book
+
+
+    async def estimate_fill_price(
+        self, symbol: str, size: float, side: PositionSide, depth: int = 100
+    ) -> Decimal:
+        book = await self._get_book(symbol, depth)
+        return book_fill_price(book, size, side)
+
+
+    async def estimate_fill_prices(
+        self, symbol: str, size: float, depth: int = 100
+    ) -> tuple[Decimal, Decimal]:
+        book = await self._get_book(symbol, depth)
+        return (
+            book_fill_price(book, size, PositionSide.LONG),
+            book_fill_price(book, size, PositionSide.SHORT),
+        )
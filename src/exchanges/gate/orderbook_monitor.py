@@ -1,15 +1,19 @@
 import asyncio
-import json
 import time
 from collections import deque
 from decimal import Decimal
 from typing import Any
 
+import orjson
 import websockets
-from gate_api import FuturesApi
-from gate_api.exceptions import GateApiException
+from sortedcontainers import SortedDict
 
 from ..common.models import Orderbook, OrderbookLevel
+from .adapters import adapt_orderbook, coin_from_contract
+from .rest import GateRestClient, GateRestError
+from .ws import WS_CONNECT_OPTIONS
+
+from ...logger import logger
 
 
 __all__ = ['GateOrderbookMonitor']
@@ -19,37 +23,66 @@ class GateOrderbookMonitor:
     __slots__ = (
         'settle',
         'ws_url',
-        'futures_api',
+        'rest',
+        '_snapshot_sem',
         '_orderbooks',
+        '_bid_levels',
+        '_ask_levels',
+        '_dirty',
         '_update_queues',
         '_base_ids',
         '_ready',
         '_is_ready',
         '_ws_task',
+        '_worker_task',
+        '_queue',
+        '_resync_tasks',
+        '_resync_backoff',
         '_shutdown',
         '_contracts'
     )
   
-    def __init__(self, settle: str, futures_api: FuturesApi) -> None:
+    def __init__(
+        self,
+        settle: str,
+        rest: GateRestClient,
+        snapshot_concurrency: int = 20,
+        queue_size: int = 4096
+    ) -> None:
         self.settle = settle
         self.ws_url = f'wss://fx-ws.gateio.ws/v4/ws/{settle}'
-        self.futures_api = futures_api
+        self.rest = rest
+        self._snapshot_sem = asyncio.Semaphore(snapshot_concurrency)
         self._orderbooks: dict[str, Orderbook] = {}
+        # Уровни стакана, отсортированные по цене; живут между обновлениями.
+        # Ключ бидов - цена со знаком минус, чтобы обе стороны шли от лучшей цены
+        self._bid_levels: dict[str, SortedDict] = {}
+        self._ask_levels: dict[str, SortedDict] = {}
+        # Символы, у которых списки уровней в Orderbook отстали от SortedDict
+        self._dirty: set[str] = set()
         self._update_queues: dict[str, deque[dict[str, Any]]] = {}
         self._base_ids: dict[str, int] = {}
         self._ready = asyncio.Event()
         self._is_ready = False
         self._ws_task: asyncio.Task | None = None
+        self._worker_task: asyncio.Task | None = None
+        # Чтение сокета отвязано от разбора; при переполнении читатель ждет (backpressure TCP)
+        self._queue: asyncio.Queue[str] = asyncio.Queue(queue_size)
+        # Пересинхронизация идет фоном по символу, не блокируя разбор остальных
+        self._resync_tasks: dict[str, asyncio.Task] = {}
+        # Символ -> (монотонное время следующей попытки, текущая задержка) после неудачного снапшота
+        self._resync_backoff: dict[str, tuple[float, float]] = {}
         self._shutdown = asyncio.Event()
         self._contracts: list[str] = []
 
 
-    async def _handle_message(self, message: str) -> None:
+    def _handle_message(self, message: str) -> None:
+        # Кадры других каналов (ошибки, служебные) отбрасываем без разбора JSON
+        if 'futures.order_book_update' not in message:
+            return
+        
         try:
-            msg = json.loads(message)
-            
-            channel = msg.get('channel')
-            event = msg.get('event')
+            msg = orjson.loads(message)
             
             if msg.get('channel') != 'futures.order_book_update':
                 return
@@ -62,35 +95,46 @@ class GateOrderbookMonitor:
                     return
                 
                 contract = result['s']
-                symbol = contract.replace('_USDT', '')
+                symbol = coin_from_contract(contract)
                 
                 update_id_first = result['U']
                 update_id_last = result['u']
                 
-                if symbol not in self._base_ids:
-                    if symbol not in self._update_queues:
-                        self._update_queues[symbol] = deque(maxlen=1000)
-                    self._update_queues[symbol].append(result)
-                    return
+                base_ids = self._base_ids
+                base_id = base_ids.get(symbol)
                 
-                base_id = self._base_ids[symbol]
+                if base_id is None:
+                    queue = self._update_queues.get(symbol)
+                    if queue is None:
+                        queue = self._update_queues[symbol] = deque(maxlen=1000)
+                    queue.append(result)
+                    
+                    # Прошлая пересинхронизация не удалась: пробуем снова
+                    if symbol in self._orderbooks and symbol not in self._resync_tasks:
+                        backoff = self._resync_backoff.get(symbol)
+                        if backoff is None or backoff[0] <= time.monotonic():
+                            self._schedule_resync(symbol, contract)
+                    return
                 
                 if update_id_first > base_id + 1:
-                    await self._resync_orderbook(symbol, contract)
+                    # До прихода снапшота кадры символа копятся в _update_queues
+                    del base_ids[symbol]
+                    self._update_queues[symbol] = deque((result,), maxlen=1000)
+                    self._schedule_resync(symbol, contract)
                     return
                 
                 if update_id_last < base_id + 1:
                     return
                 
                 self._apply_update(symbol, result)
-                self._base_ids[symbol] = update_id_last
+                base_ids[symbol] = update_id_last
             
             elif event == 'subscribe':
                 if not self._is_ready:
                     self._is_ready = True
                     self._ready.set()
         
-        except (KeyError, ValueError, TypeError, json.JSONDecodeError) as e:
+        except (KeyError, ValueError, TypeError):
             pass
 
     def _apply_update(self, symbol: str, update: dict[str, Any]) -> None:
@@ -98,65 +142,79 @@ class GateOrderbookMonitor:
         if not book:
             return
         
-        bids_dict = {level.price: level for level in book.bids}
-        asks_dict = {level.price: level for level in book.asks}
-        
-        for bid in update.get('b', []):
-            price = Decimal(bid['p'])
-            size = Decimal(str(bid['s']))
+        # Ключи уровней - цена во float: сравнение и хеширование нативные,
+        # Decimal строится только для вставляемых уровней, пересортировки нет
+        bid_updates = update.get('b')
+        if bid_updates:
+            bids_dict = self._bid_levels[symbol]
             
-            if size == 0:
-                bids_dict.pop(price, None)
-            else:
-                bids_dict[price] = OrderbookLevel(price=price, size=size)
+            for bid in bid_updates:
+                raw_price = bid['p']
+                size = bid['s']
+                
+                if size == 0:
+                    bids_dict.pop(-float(raw_price), None)
+                else:
+                    bids_dict[-float(raw_price)] = OrderbookLevel(Decimal(raw_price), Decimal(size))
         
-        for ask in update.get('a', []):
-            price = Decimal(ask['p'])
-            size = Decimal(str(ask['s']))
+        ask_updates = update.get('a')
+        if ask_updates:
+            asks_dict = self._ask_levels[symbol]
             
-            if size == 0:
-                asks_dict.pop(price, None)
-            else:
-                asks_dict[price] = OrderbookLevel(price=price, size=size)
+            for ask in ask_updates:
+                raw_price = ask['p']
+                size = ask['s']
+                
+                if size == 0:
+                    asks_dict.pop(float(raw_price), None)
+                else:
+                    asks_dict[float(raw_price)] = OrderbookLevel(Decimal(raw_price), Decimal(size))
         
-        book.bids = sorted(bids_dict.values(), key=lambda x: x.price, reverse=True)
-        book.asks = sorted(asks_dict.values(), key=lambda x: x.price)
+        # Списки уровней собираются лениво, только когда стакан запрашивают
+        self._dirty.add(symbol)
         book.timestamp = int(update['t'] * 1000)
 
 
-    async def _resync_orderbook(self, symbol: str, contract: str) -> None:
+    def _schedule_resync(self, symbol: str, contract: str) -> None:
+        if symbol in self._resync_tasks:
+            return
+        
+        task = asyncio.create_task(self._resync(symbol, contract))
+        self._resync_tasks[symbol] = task
+        task.add_done_callback(lambda _: self._resync_tasks.pop(symbol, None))
+
+
+    async def _resync(self, symbol: str, contract: str, max_delay: float = 60.0) -> None:
         await self._fetch_snapshot(symbol, contract)
+        
+        if symbol in self._base_ids:
+            self._resync_backoff.pop(symbol, None)
+            return
+        
+        # Снапшот не получен: следующая попытка не раньше чем через удвоенную задержку,
+        # чтобы сломанный контракт не выбирал общий лимит REST
+        backoff = self._resync_backoff.get(symbol)
+        delay = min(backoff[1] * 2, max_delay) if backoff else 1.0
+        self._resync_backoff[symbol] = (time.monotonic() + delay, delay)
 
 
     async def _fetch_snapshot(self, symbol: str, contract: str, max_retries: int = 5) -> None:
         for attempt in range(max_retries):
             try:
-                raw = await asyncio.to_thread(
-                    self.futures_api.list_futures_order_book,
-                    self.settle,
-                    contract,
-                    limit=50,
-                    with_id='true'
-                )
+                async with self._snapshot_sem:
+                    snapshot = await self.rest.get(
+                        '/order_book',
+                        {'contract': contract, 'limit': 50, 'with_id': 'true'}
+                    )
                 
-                snapshot = raw.to_dict()
                 base_id = snapshot['id']
                 
-                bids = [
-                    OrderbookLevel(price=Decimal(level['p']), size=Decimal(str(level['s'])))
-                    for level in snapshot['bids']
-                ]
-                asks = [
-                    OrderbookLevel(price=Decimal(level['p']), size=Decimal(str(level['s'])))
-                    for level in snapshot['asks']
-                ]
+                book = adapt_orderbook(snapshot, symbol)
                 
-                self._orderbooks[symbol] = Orderbook(
-                    symbol=symbol,
-                    bids=bids,
-                    asks=asks,
-                    timestamp=int(snapshot['current'] * 1000)
-                )
+                self._bid_levels[symbol] = SortedDict((-float(level.price), level) for level in book.bids)
+                self._ask_levels[symbol] = SortedDict((float(level.price), level) for level in book.asks)
+                self._orderbooks[symbol] = book
+                self._dirty.discard(symbol)
                 self._base_ids[symbol] = base_id
                 
                 if symbol in self._update_queues:
@@ -182,58 +240,75 @@ class GateOrderbookMonitor:
                 
                 return
             
-            except GateApiException as ex:
+            except GateRestError as ex:
                 if ex.label == 'TOO_MANY_REQUESTS' and attempt < max_retries - 1:
                     reset_ts = ex.headers.get('X-Gate-RateLimit-Reset')
                     if reset_ts:
                         wait_time = int(reset_ts) - int(time.time()) + 0.1
                         if wait_time > 0:
-                            print(f"[RATE LIMIT] Waiting {wait_time:.1f}s until {reset_ts}")
+                            logger.warning("[GATE OB] Rate limited on {}, waiting {:.1f}s", symbol, wait_time)
                             await asyncio.sleep(wait_time)
                     else:
                         await asyncio.sleep(2 ** attempt)
                 else:
-                    print(f"[DEBUG] Failed to fetch {symbol}: {type(ex).__name__}: {ex.message}")
+                    logger.error("[GATE OB] Failed to fetch snapshot for {}: {} {}", symbol, ex.label, ex.message)
                     return
             
             except Exception as e:
-                print(f"[DEBUG] Failed to fetch {symbol}: {type(e).__name__}: {e}")
+                logger.error("[GATE OB] Failed to fetch snapshot for {}: {}: {}", symbol, type(e).__name__, e)
                 return
 
 
     async def _ws_loop(self, contracts: list[str]) -> None:
         while not self._shutdown.is_set():
             try:
-                async with websockets.connect(self.ws_url) as ws:
-                    # Отправляем все подписки без задержки для максимальной скорости
-                    for contract in contracts:
-                        subscribe_msg = json.dumps({
-                            'time': int(time.time()),
+                async with websockets.connect(self.ws_url, **WS_CONNECT_OPTIONS) as ws:
+                    # Кадры подписки собираем один раз на соединение и отправляем подряд без задержки
+                    now = int(time.time())
+                    subscribe_frames = [
+                        orjson.dumps({
+                            'time': now,
                             'channel': 'futures.order_book_update',
                             'event': 'subscribe',
                             'payload': [contract, '100ms', '50']
-                        })
-                        await ws.send(subscribe_msg)
-                        await asyncio.sleep(0.1)
+                        }).decode()
+                        for contract in contracts
+                    ]
+                    for frame in subscribe_frames:
+                        await ws.send(frame)
 
+                    queue = self._queue
+                    
                     async for message in ws:
                         if self._shutdown.is_set():
                             break
-                        await self._handle_message(message)
+                        await queue.put(message)
             
             except (websockets.exceptions.WebSocketException, ConnectionError, OSError):
                 if not self._shutdown.is_set():
                     await asyncio.sleep(5)
 
 
+    async def _drain(self) -> None:
+        queue = self._queue
+        
+        while True:
+            message = await queue.get()
+            try:
+                self._handle_message(message)
+            except Exception as e:
+                logger.error("[GATE OB] Failed to handle update: {}: {}", type(e).__name__, e)
+
+
     async def start(self, contracts: list[str]) -> None:
         self._contracts = contracts
         
+        self._worker_task = asyncio.create_task(self._drain())
         self._ws_task = asyncio.create_task(self._ws_loop(contracts))
         await self._ready.wait()
         
         tasks = [
-            self._fetch_snapshot(contract.replace('_USDT', ''), contract)
+            self._fetch_snapshot(coin_from_contract(contract), contract)
             for contract in contracts
         ]
         
@@ -242,30 +317,38 @@ class GateOrderbookMonitor:
 
     async def stop(self) -> None:
         self._shutdown.set()
-        if self._ws_task:
-            self._ws_task.cancel()
-            try:
-                await self._ws_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._ws_task, self._worker_task, *self._resync_tasks.values()):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
 
 
     def get_orderbook(self, symbol: str) -> Orderbook | None:
-        return self._orderbooks.get(symbol)
+        book = self._orderbooks.get(symbol)
+        
+        if book is not None and symbol in self._dirty:
+            self._dirty.discard(symbol)
+            book.bids = list(self._bid_levels[symbol].values())
+            book.asks = list(self._ask_levels[symbol].values())
+        
+        return book
 
 
     def get_best_bid(self, symbol: str) -> OrderbookLevel | None:
-        book = self._orderbooks.get(symbol)
-        if not book or not book.bids:
+        levels = self._bid_levels.get(symbol)
+        if not levels:
             return None
-        return book.bids[0]
+        return levels.peekitem(0)[1]
 
 
     def get_best_ask(self, symbol: str) -> OrderbookLevel | None:
-        book = self._orderbooks.get(symbol)
-        if not book or not book.asks:
+        levels = self._ask_levels.get(symbol)
+        if not levels:
             return None
-        return book.asks[0]
+        return levels.peekitem(0)[1]
 
 
     def has_orderbook(self, symbol: str) -> bool:
@@ -1,11 +1,14 @@
 import asyncio
-import json
 import time
 from typing import Any
 
+import orjson
 import websockets
 from websockets.client import WebSocketClientProtocol
 
+from .adapters import coin_from_contract
+from .ws import WS_CONNECT_OPTIONS
+
 
 __all__ = ['GatePriceMonitor']
 
@@ -25,7 +28,7 @@ class GatePriceMonitor:
 
     async def _handle_message(self, message: str) -> None:
         try:
-            msg = json.loads(message)
+            msg = orjson.loads(message)
             channel = msg.get('channel')
             
             if channel == 'futures.tickers':
@@ -34,8 +37,7 @@ class GatePriceMonitor:
                 if event == 'update':
                     prices = self._prices
                     for ticker in msg['result']:
-                        contract = ticker['contract'].replace('_USDT', '')
-                        prices[contract] = float(ticker['last'])
+                        prices[coin_from_contract(ticker['contract'])] = float(ticker['last'])
                     
                     if not self._is_ready:
                         self._is_ready = True
@@ -45,20 +47,20 @@ class GatePriceMonitor:
                     self._is_ready = True
                     self._ready.set()
         
-        except (KeyError, ValueError, TypeError, json.JSONDecodeError):
+        except (KeyError, ValueError, TypeError):
             pass
 
 
     async def _ws_loop(self, contracts: list[str]) -> None:
         while not self._shutdown.is_set():
             try:
-                async with websockets.connect(self.ws_url) as ws:
-                    subscribe_msg = json.dumps({
+                async with websockets.connect(self.ws_url, **WS_CONNECT_OPTIONS) as ws:
+                    subscribe_msg = orjson.dumps({
                         'time': int(time.time()),
                         'channel': 'futures.tickers',
                         'event': 'subscribe',
                         'payload': contracts
-                    })
+                    }).decode()
                     await ws.send(subscribe_msg)
                     
                     async for message in ws:
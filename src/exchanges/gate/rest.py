@@ -0,0 +1,61 @@
+from typing import Any, Mapping
+
+import aiohttp
+import orjson
+
+from ..common.exceptions import ExchangeError
+from ..common.rate_limiter import AsyncRateLimiter
+
+
+__all__ = ['GateRestClient', 'GateRestError']
+
+
+class GateRestError(ExchangeError):
+    def __init__(self, status: int, label: str, message: str, headers: Mapping[str, str]) -> None:
+        super().__init__(f'{status} {label}: {message}')
+        self.status = status
+        self.label = label
+        self.message = message
+        self.headers = headers
+
+
+class GateRestClient:
+    __slots__ = ('base_url', 'rate_limiter', '_session')
+
+    def __init__(self, host: str, settle: str, rate_limiter: AsyncRateLimiter) -> None:
+        self.base_url = f'{host}/futures/{settle}'
+        self.rate_limiter = rate_limiter
+        self._session: aiohttp.ClientSession | None = None
+
+
+    async def start(self) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+    async def get(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        async with self.rate_limiter:
+            async with self._session.get(f'{self.base_url}{path}', params=params) as resp:
+                body = await resp.read()
+
+                if resp.status >= 400:
+                    try:
+                        error = orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        error = {}
+                    raise GateRestError(
+                        resp.status,
+                        error.get('label', ''),
+                        error.get('message', body.decode(errors='replace')),
+                        resp.headers
+                    )
+
+                return orjson.loads(body)
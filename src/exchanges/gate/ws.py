@@ -0,0 +1,15 @@
+from typing import Any
+
+
+__all__ = ['WS_CONNECT_OPTIONS']
+
+
+# Ограничиваем буфер входящих кадров и быстрее замечаем оборванное или зависшее соединение
+WS_CONNECT_OPTIONS: dict[str, Any] = {
+    'max_size': 2**20,
+    'max_queue': 32,
+    'ping_interval': 10,
+    'ping_timeout': 5,
+    'open_timeout': 5,
+    'compression': None,
+}
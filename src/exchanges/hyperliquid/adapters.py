@@ -1,10 +1,16 @@
 from decimal import Decimal
+from operator import itemgetter
 from typing import Any
 import time
 
 from ..common.models import Balance, FundingRate, Order, Orderbook, OrderbookLevel, OrderStatus, Position, PositionSide, SymbolInfo, Volume24h
 
 
+_ZERO = Decimal('0')
+
+_level_fields = itemgetter('px', 'sz')
+
+
 def adapt_position(raw: dict[str, Any]) -> Position:
     pos = raw['position']
     szi = Decimal(pos['szi'])
@@ -34,7 +40,7 @@ def adapt_order(raw: dict[str, Any], symbol: str, size: float, side: PositionSid
         coin=symbol,
         size=Decimal(str(size)),
         side=side,
-        fill_price=Decimal('0'),
+        fill_price=_ZERO,
         status=OrderStatus.REJECTED,
         )
   
@@ -45,7 +51,7 @@ def adapt_order(raw: dict[str, Any], symbol: str, size: float, side: PositionSid
         coin=symbol,
         size=Decimal(str(size)),
         side=side,
-        fill_price=Decimal('0'),
+        fill_price=_ZERO,
         status=OrderStatus.REJECTED,
         )
   
@@ -58,7 +64,7 @@ def adapt_order(raw: dict[str, Any], symbol: str, size: float, side: PositionSid
         coin=symbol,
         size=Decimal(str(size)),
         side=side,
-        fill_price=Decimal('0'),
+        fill_price=_ZERO,
         status=OrderStatus.REJECTED,
         )
   
@@ -71,7 +77,7 @@ def adapt_order(raw: dict[str, Any], symbol: str, size: float, side: PositionSid
         coin=symbol,
         size=Decimal(str(size)),
         side=side,
-        fill_price=Decimal('0'),
+        fill_price=_ZERO,
         status=OrderStatus.PARTIAL,
         )
     
@@ -117,24 +123,17 @@ def adapt_funding_rate(raw: dict[str, Any], symbol: str) -> FundingRate:
     )
 
 
+def adapt_levels(raw_levels: list[dict[str, Any]]) -> list[OrderbookLevel]:
+    return [OrderbookLevel(Decimal(px), Decimal(sz)) for px, sz in map(_level_fields, raw_levels)]
+
+
 def adapt_orderbook(raw: dict[str, Any]) -> Orderbook:
-    levels = raw['levels']
-    bids_raw = levels[0]
-    asks_raw = levels[1]
-    
-    bids = [
-        OrderbookLevel(price=Decimal(level['px']), size=Decimal(level['sz']))
-        for level in bids_raw
-    ]
-    asks = [
-        OrderbookLevel(price=Decimal(level['px']), size=Decimal(level['sz']))
-        for level in asks_raw
-    ]
+    bids_raw, asks_raw = raw['levels']
     
     return Orderbook(
         symbol=raw['coin'],
-        bids=bids,
-        asks=asks,
+        bids=adapt_levels(bids_raw),
+        asks=adapt_levels(asks_raw),
         timestamp=raw['time']
     )
 
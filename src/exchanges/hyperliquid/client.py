@@ -1,5 +1,7 @@
 import asyncio
-from typing import Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 from decimal import Decimal
 
 import eth_account
@@ -7,7 +9,10 @@ from eth_account.signers.local import LocalAccount
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 
+from ..common.coalescer import RequestCoalescer
 from ..common.exceptions import OrderError
+from ..common.fill import book_fill_price
+from ..common.leverage import apply_leverages
 from ..common.models import (
     Balance, FundingRate, Order, Orderbook, Position, PositionSide, SymbolInfo, Volume24h
 )
@@ -29,12 +34,17 @@ class HyperliquidClient:
         'secret_key',
         'account_address',
         'meta_update_interval',
+        'funding_cache_ttl',
         'info',
         'exchange',
         'price_monitor',
         'orderbook_monitor',
         'assets_meta',
+        '_symbol_info',
         '_leverage_cache',
+        '_funding_cache',
+        '_coalescer',
+        '_executor',
         '_update_task',
         '_shutdown',
         '_account'
@@ -45,11 +55,14 @@ class HyperliquidClient:
         secret_key: str,
         account_address: str,
         base_url: str | None = None,
-        meta_update_interval: int = 300
+        meta_update_interval: int = 300,
+        funding_cache_ttl: float = 60.0,
+        max_workers: int = 16
     ):
         self.secret_key = secret_key
         self.account_address = account_address
         self.meta_update_interval = meta_update_interval
+        self.funding_cache_ttl = funding_cache_ttl
 
         self._account: LocalAccount = eth_account.Account.from_key(secret_key)
         self.info = Info(base_url=base_url, skip_ws=False)
@@ -60,7 +73,11 @@ class HyperliquidClient:
         )
 
         self.assets_meta: dict[str, dict[str, Any]] = {}
+        self._symbol_info: dict[str, SymbolInfo] = {}
         self._leverage_cache: dict[str, int] = {}
+        self._funding_cache: dict[str, tuple[FundingRate, float]] = {}
+        self._coalescer = RequestCoalescer()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hl-rest')
         self._update_task = None
         self._shutdown = asyncio.Event()
 
@@ -78,14 +95,17 @@ class HyperliquidClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         self._shutdown.set()
         if self._update_task:
+            self._update_task.cancel()
             await self._update_task
 
         if self.info.ws_manager:
             self.info.disconnect_websocket()
 
+        self._executor.shutdown(wait=False)
+
 
     async def _refresh_meta(self) -> None:
-        meta, _ = await asyncio.to_thread(self.info.meta_and_asset_ctxs)
+        meta, _ = await self._call(self.info.meta_and_asset_ctxs)
 
         assets = {}
         for asset in meta['universe']:
@@ -97,25 +117,34 @@ class HyperliquidClient:
                 }
 
         self.assets_meta = assets
+        self._symbol_info = {name: adapt_symbol_info(raw) for name, raw in assets.items()}
 
 
     async def _meta_updater(self) -> None:
-        shutdown_wait = self._shutdown.wait
         interval = self.meta_update_interval
 
         while not self._shutdown.is_set():
             try:
-                await asyncio.wait_for(shutdown_wait(), timeout=interval)
-            except asyncio.TimeoutError:
+                await asyncio.sleep(interval)
                 await self._refresh_meta()
+            except asyncio.CancelledError:
+                break
+
+
+    def _call(self, fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+
+    def _needs_leverage_update(self, symbol: str, leverage: int) -> bool:
+        return self._leverage_cache.get(symbol) != leverage
 
 
     async def set_leverage(self, symbol: str, leverage: int) -> None:
-        if self._leverage_cache.get(symbol) == leverage:
+        if not self._needs_leverage_update(symbol, leverage):
             return
 
         try:
-            await asyncio.to_thread(
+            await self._call(
                 self.exchange.update_leverage,
                 leverage,
                 symbol,
@@ -127,19 +156,11 @@ class HyperliquidClient:
 
 
     async def set_leverages(self, leverages: dict[str, int], batch_size: int = 10) -> None:
-        items = list(leverages.items())
-        
-        for i in range(0, len(items), batch_size):
-            batch = items[i:i + batch_size]
-            tasks = [self.set_leverage(symbol, lev) for symbol, lev in batch]
-            await asyncio.gather(*tasks)
+        await apply_leverages(leverages, self._needs_leverage_update, self.set_leverage, batch_size)
 
 
     def get_symbol_info(self, symbol: str) -> SymbolInfo | None:
-        raw = self.assets_meta.get(symbol)
-        if not raw:
-            return None
-        return adapt_symbol_info(raw)
+        return self._symbol_info.get(symbol)
 
 
     def get_available_symbols(self) -> set[str]:
@@ -148,7 +169,7 @@ class HyperliquidClient:
 
     async def buy_market(self, symbol: str, size: float, slippage: float = 0.05) -> Order:
         try:
-            raw = await asyncio.to_thread(
+            raw = await self._call(
                 self.exchange.market_open,
                 symbol,
                 True,
@@ -163,7 +184,7 @@ class HyperliquidClient:
 
     async def sell_market(self, symbol: str, size: float, slippage: float = 0.05) -> Order:
         try:
-            raw = await asyncio.to_thread(
+            raw = await self._call(
                 self.exchange.market_open,
                 symbol,
                 False,
@@ -178,9 +199,8 @@ class HyperliquidClient:
 
     async def get_positions(self) -> list[Position]:
         try:
-            state = await asyncio.to_thread(
-                self.info.user_state,
-                self.account_address
+            state = await self._coalescer.run(
+                'user_state', lambda: self._call(self.info.user_state, self.account_address)
             )
 
             positions = []
@@ -197,9 +217,8 @@ class HyperliquidClient:
 
     async def get_balance(self) -> Balance:
         try:
-            state = await asyncio.to_thread(
-                self.info.user_state,
-                self.account_address
+            state = await self._coalescer.run(
+                'user_state', lambda: self._call(self.info.user_state, self.account_address)
             )
             return adapt_balance(state)
         except Exception as ex:
@@ -207,22 +226,32 @@ class HyperliquidClient:
 
 
     async def get_funding_rate(self, symbol: str) -> FundingRate:
-        try:
-            meta, asset_ctxs = await asyncio.to_thread(self.info.meta_and_asset_ctxs)
+        cached = self._funding_cache.get(symbol)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
 
-            for i, asset in enumerate(meta['universe']):
-                if asset['name'] == symbol:
-                    ctx = asset_ctxs[i]
-                    return adapt_funding_rate(ctx, symbol)
-
-            raise OrderError(f"Symbol {symbol} not found")
+        try:
+            # Контексты всех монет приходят одним запросом: обновляем кэш целиком
+            meta, asset_ctxs = await self._coalescer.run(
+                'asset_ctxs', lambda: self._call(self.info.meta_and_asset_ctxs)
+            )
         except Exception as ex:
             raise OrderError(f"Failed to get funding rate for {symbol}: {str(ex)}") from ex
 
+        expiry = time.monotonic() + self.funding_cache_ttl
+        for asset, ctx in zip(meta['universe'], asset_ctxs):
+            name = asset['name']
+            self._funding_cache[name] = (adapt_funding_rate(ctx, name), expiry)
+
+        cached = self._funding_cache.get(symbol)
+        if cached is None:
+            raise OrderError(f"Failed to get funding rate for {symbol}: Symbol {symbol} not found")
+        return cached[0]
+
 
     async def get_orderbook(self, symbol: str, depth: int = 20) -> Orderbook:
         try:
-            raw = await asyncio.to_thread(self.info.l2_snapshot, symbol)
+            raw = await self._call(self.info.l2_snapshot, symbol)
 
             book = adapt_orderbook(raw)
 
@@ -236,7 +265,7 @@ class HyperliquidClient:
 
     async def get_24h_volume(self, symbol: str) -> Volume24h:
         try:
-            meta, asset_ctxs = await asyncio.to_thread(self.info.meta_and_asset_ctxs)
+            meta, asset_ctxs = await self._call(self.info.meta_and_asset_ctxs)
 
             for i, asset in enumerate(meta['universe']):
                 if asset['name'] == symbol:
@@ -248,38 +277,27 @@ class HyperliquidClient:
             raise OrderError(f"Failed to get 24h volume for {symbol}: {str(ex)}") from ex
 
 
-    async def estimate_fill_price(
-        self, symbol: str, size: float, side: PositionSide, depth: int = 100
-    ) -> Decimal:
+    async def _get_book(self, symbol: str, depth: int) -> Orderbook:
         book = self.orderbook_monitor.get_orderbook(symbol)
 
         if not book:
             book = await self.get_orderbook(symbol, depth=min(depth, 50))
 
-        levels = book.asks if side == PositionSide.LONG else book.bids
-
-        if not levels:
-            raise OrderError(f"No orderbook data for {symbol}")
+        return book
 
-        remaining = Decimal(str(abs(size)))
-        total_cost = Decimal('0')
-        filled = Decimal('0')
 
-        for level in levels:
-            if remaining <= 0:
-                break
-
-            fill = min(remaining, level.size)
-            total_cost += fill * level.price
-            filled += fill
-            remaining -= fill
-
-        if remaining > 0:
-            last_level = levels[-1]
-            slippage_factor = Decimal('1.005') if side == PositionSide.LONG else Decimal('0.995')
-            extrapolated_price = last_level.price * slippage_factor
+    async def estimate_fill_price(
+        self, symbol: str, size: float, side: PositionSide, depth: int = 100
+    ) -> Decimal:
+        book = await self._get_book(symbol, depth)
+        return book_fill_price(book, size, side)
 
-            total_cost += remaining * extrapolated_price
-            filled += remaining
 
-        return total_cost / filled
+    async def estimate_fill_prices(
+        self, symbol: str, size: float, depth: int = 100
+    ) -> tuple[Decimal, Decimal]:
+        book = await self._get_book(symbol, depth)
+        return (
+            book_fill_price(book, size, PositionSide.LONG),
+            book_fill_price(book, size, PositionSide.SHORT),
+        )
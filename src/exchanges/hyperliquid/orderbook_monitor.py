@@ -1,21 +1,24 @@
 import asyncio
-from decimal import Decimal
 from typing import Any
 
 from hyperliquid.info import Info
 
 from ..common.models import Orderbook, OrderbookLevel
+from .adapters import adapt_orderbook
 
 
 __all__ = ['HyperliquidOrderbookMonitor']
 
 
 class HyperliquidOrderbookMonitor:
-    __slots__ = ('info', '_orderbooks', '_ready', '_is_ready', '_loop')
+    __slots__ = ('info', '_raw_books', '_orderbooks', '_ready', '_is_ready', '_loop')
 
     def __init__(self, info: Info) -> None:
         self.info = info
-        self._orderbooks: dict[str, Orderbook] = {}
+        # Сырые l2Book из WS; в Decimal разбираются только при чтении
+        self._raw_books: dict[str, dict[str, Any]] = {}
+        # symbol -> (сырой снимок, из которого построен стакан, стакан)
+        self._orderbooks: dict[str, tuple[dict[str, Any], Orderbook]] = {}
         self._ready = asyncio.Event()
         self._is_ready = False
         self._loop: asyncio.AbstractEventLoop | None = None
@@ -26,24 +29,7 @@ class HyperliquidOrderbookMonitor:
             return
 
         data = msg['data']
-        symbol = data['coin']
-        levels = data['levels']
-
-        bids = [
-            OrderbookLevel(price=Decimal(level['px']), size=Decimal(level['sz']))
-            for level in levels[0]
-        ]
-        asks = [
-            OrderbookLevel(price=Decimal(level['px']), size=Decimal(level['sz']))
-            for level in levels[1]
-        ]
-
-        self._orderbooks[symbol] = Orderbook(
-            symbol=symbol,
-            bids=bids,
-            asks=asks,
-            timestamp=data['time']
-        )
+        self._raw_books[data['coin']] = data
 
         if not self._is_ready and self._loop:
             self._is_ready = True
@@ -60,22 +46,33 @@ class HyperliquidOrderbookMonitor:
 
 
     def get_orderbook(self, symbol: str) -> Orderbook | None:
-        return self._orderbooks.get(symbol)
+        raw = self._raw_books.get(symbol)
+        if raw is None:
+            return None
+
+        # Стакан пересобирается только если с прошлого чтения пришел новый снимок
+        cached = self._orderbooks.get(symbol)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
+        book = adapt_orderbook(raw)
+        self._orderbooks[symbol] = (raw, book)
+        return book
 
 
     def get_best_bid(self, symbol: str) -> OrderbookLevel | None:
-        book = self._orderbooks.get(symbol)
+        book = self.get_orderbook(symbol)
         if not book or not book.bids:
             return None
         return book.bids[0]
 
 
     def get_best_ask(self, symbol: str) -> OrderbookLevel | None:
-        book = self._orderbooks.get(symbol)
+        book = self.get_orderbook(symbol)
         if not book or not book.asks:
             return None
         return book.asks[0]
 
 
     def has_orderbook(self, symbol: str) -> bool:
-        return symbol in self._orderbooks
+        return symbol in self._raw_books
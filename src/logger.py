@@ -38,6 +38,7 @@ def setup():
     rotation="100 MB",
     retention="30 days",
     compression="zip",
+    enqueue=True,
   )
   
   logger.add(
@@ -47,6 +48,7 @@ def setup():
     rotation="50 MB",
     retention="90 days",
     compression="zip",
+    enqueue=True,
   )
   
   logger.level("SUCCESS", color="<green>")